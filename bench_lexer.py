@@ -0,0 +1,46 @@
+# To run this file directly
+# python bench_lexer.py [statements] [workers...]
+# e.g. python bench_lexer.py 200000 1 2 4 8
+
+import sys
+import time
+from lexer.lexer_module import Lexer
+
+# Build a large source of repeated statements
+def build_source(statements):
+    return " ".join(f"x{i} = (y{i} + {i}) * 2 - z / 4;" for i in range(statements))
+
+# Time one lexing run
+def time_lex(source, workers):
+    lexer = Lexer(source)
+    start = time.perf_counter()
+    result = lexer.lex() if workers == 1 else lexer.lex_parallel(workers)
+    return time.perf_counter() - start, result
+
+# Helper function to print throughput per worker count
+def print_scaling(source, worker_counts):
+    print("Lexer Throughput:")
+    print("  ┌─────────┬────────────┬──────────────┬─────────┬─────────┐")
+    print("  │ Workers │ Time (s)   │ MB/s         │ Speedup │ Match   │")
+    print("  ├─────────┼────────────┼──────────────┼─────────┼─────────┤")
+    base_time, base = time_lex(source, 1)
+    base_key = ([(t.type, t.lexeme, t.pos) for t in base[0]], base[1], list(base[2].items()))
+    mb = len(source.encode()) / 1_000_000
+    for workers in worker_counts:
+        if workers == 1:
+            elapsed, same = base_time, True
+        else:
+            elapsed, result = time_lex(source, workers)
+            same = ([(t.type, t.lexeme, t.pos) for t in result[0]], result[1], list(result[2].items())) == base_key
+        print(f"  │ {workers:<7} │ {elapsed:<10.3f} │ {mb / elapsed:<12.2f} │ "
+              f"{base_time / elapsed:<7.2f} │ {'yes' if same else 'NO':<7} │")
+    print("  └─────────┴────────────┴──────────────┴─────────┴─────────┘\n")
+
+# Main program
+if __name__ == "__main__":
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    worker_counts = [int(w) for w in sys.argv[2:]] or [1, 2, 4, 8]
+
+    source = build_source(statements)
+    print(f"Source: {statements} statements, {len(source)} characters\n")
+    print_scaling(source, worker_counts)
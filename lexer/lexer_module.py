@@ -1,4 +1,7 @@
 from .token_module import Token
+from concurrent.futures import ProcessPoolExecutor
+import gc
+import os
 import re
 
 PATTERN = {
@@ -17,6 +20,40 @@ IDENT_RE = re.compile(PATTERN['IDENTIFIER'])
 NUMBER_RE = re.compile(PATTERN['NUMBER'])
 SINGLE_RE = {k: re.compile(v) for k, v in PATTERN['SINGLE'].items()}
 
+# Inputs shorter than this are lexed sequentially by lex_parallel
+MIN_PARALLEL_LENGTH = 100_000
+
+# Split source into about n ranges, each ending right after a ';'
+def split_at_terminators(source: str, n: int) -> list[tuple[int, int]]:
+    """Returns a list of (start, end) ranges covering the whole source.
+    A ';' is always a token on its own, so lexing each range separately
+    yields the same tokens as lexing the whole source.
+    """
+    length = len(source)
+    ranges = []
+    start = 0
+    for i in range(1, n):
+        target = max(start, length * i // n)
+        semi = source.find(';', target)
+        if semi == -1:
+            break
+        end = semi + 1
+        if end > start:
+            ranges.append((start, end))
+            start = end
+    if start < length or not ranges:
+        ranges.append((start, length))
+    return ranges
+
+# Lex one chunk in a worker process, shifting positions by the chunk offset
+def _lex_chunk(args):
+    chunk, offset = args
+    tokens, invalids, counts = Lexer(chunk).lex()
+    # Plain tuples pickle several times faster than Token objects
+    tokens = [(t.type, t.lexeme, t.pos + offset) for t in tokens]
+    invalids = [(pos + offset, char) for pos, char in invalids]
+    return tokens, invalids, counts
+
 class Lexer:
     def __init__(self, source: str):
         self.source = source # Input source code as a string
@@ -106,3 +143,49 @@ class Lexer:
         counts_by_type['INVALID'] = len(self.invalids)
 
         return self.tokens, self.invalids, counts_by_type
+
+    # Parallel lexing function
+    def lex_parallel(self, workers: int = None) -> tuple[list[Token], list[tuple[int, str]], dict[str, int]]:
+        """Same result as lex(), but the source is split at ';' boundaries
+        and each chunk is lexed in a separate worker process.
+        """
+        workers = workers or os.cpu_count() or 1
+        # Already lexed, or too small to be worth the worker start-up
+        if self.position >= self.length or workers <= 1 or self.length < MIN_PARALLEL_LENGTH:
+            return self.lex()
+
+        ranges = split_at_terminators(self.source, workers)
+        if len(ranges) == 1:
+            return self.lex()
+
+        chunks = [(self.source[start:end], start) for start, end in ranges]
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+            results = list(pool.map(_lex_chunk, chunks))
+
+        # Merge chunk results in source order
+        tokens: list[Token] = []
+        invalids: list[tuple[int, str]] = []
+        counts_by_type: dict[str, int] = {}
+        # Rebuilding runs in this process only, so pause the cyclic GC:
+        # its repeated passes over millions of new tokens cost more than the tokens themselves
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for chunk_tokens, chunk_invalids, counts in results:
+                tokens.extend(Token(ttype, lexeme, pos) for ttype, lexeme, pos in chunk_tokens)
+                invalids.extend(chunk_invalids)
+                for ttype, count in counts.items():
+                    if ttype not in ('TOTAL', 'INVALID'):
+                        counts_by_type[ttype] = counts_by_type.get(ttype, 0) + count
+        finally:
+            if gc_enabled:
+                gc.enable()
+        self.tokens = tokens
+        self.invalids = invalids
+        self.position = self.length
+
+        # Add summary counts
+        counts_by_type['TOTAL'] = len(self.tokens)
+        counts_by_type['INVALID'] = len(self.invalids)
+
+        return self.tokens, self.invalids, counts_by_type
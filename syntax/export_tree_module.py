@@ -1,4 +1,5 @@
 import os
+import json
 import shutil
 from PIL import Image, ImageDraw, ImageFont
 
@@ -7,6 +8,8 @@ VSPACE = 48   # vertical gap between levels
 PADDING = 24  # image padding
 TXTPAD = 10   # padding inside a node box
 FONTSIZE = 16
+MAX_PIXELS = 16_000_000  # largest single image before switching to tiles
+TILE_SIZE = 2048          # width/height of each tile in tiled mode
 
 # Compute text size for a given font
 def _text_size(text, font):
@@ -24,56 +27,109 @@ def _node_box_size(node, font):
     return tw + 2 * TXTPAD, th + 2 * TXTPAD
 
 # Get subtree size
-def _subtree_size(node, font):
-    """Returns (width, height) needed for the whole subtree rooted at node."""
+def _subtree_size(node, font, sizes):
+    """Returns (width, height) needed for the whole subtree rooted at node.
+    sizes caches results by id(node) so each subtree is measured once.
+    """
+    key = id(node)
+    if key in sizes:
+        return sizes[key]
     nw, nh = _node_box_size(node, font)
     if not node.children:
-        return nw, nh  # leaf
-    child_sizes = [_subtree_size(c, font) for c in node.children]
+        sizes[key] = (nw, nh)  # leaf
+        return sizes[key]
+    child_sizes = [_subtree_size(c, font, sizes) for c in node.children]
     total_children_w = sum(w for w, _ in child_sizes) + HSPACE * (len(child_sizes) - 1)
     total_w = max(nw, total_children_w)
     total_h = nh + VSPACE + max(h for _, h in child_sizes)
-    return total_w, total_h
-
-# Draw subtree
-def _draw_subtree(draw, node, x_center, y_top, font):
-    """Draw node centered at x_center, top at y_top; return center x of this node."""
+    sizes[key] = (total_w, total_h)
+    return sizes[key]
+
+# Lay out subtree
+def _layout_subtree(node, x_center, y_top, font, sizes, shapes):
+    """Place node centered at x_center, top at y_top, appending to shapes in drawing order:
+    - ("box", left, top, right, bottom, label)
+    - ("edge", x1, y1, x2, y2)
+    """
     label = _node_label(node)
     nw, nh = _node_box_size(node, font)
-    left = x_center - nw / 2
-    right = x_center + nw / 2
+    left = round(x_center - nw / 2)
+    right = left + nw
     bottom = y_top + nh
 
     # node box + text
-    draw.rectangle([left, y_top, right, bottom], outline="black", width=2)
-    draw.text((left + TXTPAD, y_top + TXTPAD), label, font=font, fill="black")
+    shapes.append(("box", left, y_top, right, bottom, label))
 
     if not node.children:
-        return x_center  # leaf
+        return  # leaf
 
     # Layout children block centered under parent
-    child_sizes = [_subtree_size(c, font) for c in node.children]
+    child_sizes = [_subtree_size(c, font, sizes) for c in node.children]
     total_children_w = sum(w for w, _ in child_sizes) + HSPACE * (len(child_sizes) - 1)
-    start_x = x_center - total_children_w / 2
-
-    # draw each child
-    child_centers = []
-    cx = start_x
+    cx = x_center - total_children_w / 2
     y_child = bottom + VSPACE
     for c, (cw, ch) in zip(node.children, child_sizes):
         child_center = cx + cw / 2
         # edge: parent bottom center -> child top center
-        child_nw, child_nh = _node_box_size(c, font)
-        child_top = y_child
-        child_top_center = (child_center, child_top)
-        parent_bottom_center = (x_center, bottom)
-        draw.line([parent_bottom_center, child_top_center], fill="black", width=2)
-        # draw child subtree
-        _draw_subtree(draw, c, child_center, child_top, font)
-        child_centers.append(child_center)
+        shapes.append(("edge", round(x_center), bottom, round(child_center), y_child))
+        _layout_subtree(c, child_center, y_child, font, sizes, shapes)
         cx += cw + HSPACE
 
-    return x_center
+# Lay out whole tree
+def _layout_tree(tree, font):
+    """Returns (img_w, img_h, shapes) with the root centered horizontally."""
+    sizes = {}
+    tw, th = _subtree_size(tree, font, sizes)
+    img_w = int(tw + 2 * PADDING)
+    img_h = int(th + 2 * PADDING)
+    shapes = []
+    _layout_subtree(tree, img_w / 2, PADDING, font, sizes, shapes)
+    return img_w, img_h, shapes
+
+# Draw shapes, shifted by (-dx, -dy)
+def _draw_shapes(draw, shapes, font, dx=0, dy=0):
+    for shape in shapes:
+        if shape[0] == "box":
+            _, left, top, right, bottom, label = shape
+            draw.rectangle([left - dx, top - dy, right - dx, bottom - dy], outline="black", width=2)
+            draw.text((left + TXTPAD - dx, top + TXTPAD - dy), label, font=font, fill="black")
+        else:
+            _, x1, y1, x2, y2 = shape
+            _draw_edge(draw, x1 - dx, y1 - dy, x2 - dx, y2 - dy)
+
+# Draw a 2px edge as two 1px lines
+def _draw_edge(draw, x1, y1, x2, y2):
+    """Pillow's width=2 lines are filled polygons whose rounding shifts with position,
+    so tiles would not stitch back into the same image; 1px lines are exact.
+    """
+    draw.line([(x1, y1), (x2, y2)], fill="black")
+    if abs(y2 - y1) > abs(x2 - x1):
+        draw.line([(x1 + 1, y1), (x2 + 1, y2)], fill="black")
+    else:
+        draw.line([(x1, y1 + 1), (x2, y2 + 1)], fill="black")
+
+# Get bounding box of a shape (2px slack for line width)
+def _shape_bounds(shape):
+    if shape[0] == "box":
+        _, left, top, right, bottom, _ = shape
+    else:
+        _, x1, y1, x2, y2 = shape
+        left, right = min(x1, x2), max(x1, x2)
+        top, bottom = min(y1, y2), max(y1, y2)
+    return left - 2, top - 2, right + 2, bottom + 2
+
+# Get range of tile indices covered by [lo, hi] along one axis
+def _tile_range(lo, hi, tile_size, count):
+    first = max(0, int(lo // tile_size))
+    last = min(count - 1, int(hi // tile_size))
+    return range(first, last + 1)
+
+# Load font
+def _load_font():
+    try:
+        return ImageFont.truetype("consola.ttf", FONTSIZE)  # Consolas if available
+    except:
+        return ImageFont.load_default()
 
 # Clear export folder
 def clear_export_folder():
@@ -84,24 +140,73 @@ def clear_export_folder():
 
 # Export tree as PNG
 def export_tree_png(tree, filename):
-    # font
-    try:
-        font = ImageFont.truetype("consola.ttf", FONTSIZE)  # Consolas if available
-    except:
-        font = ImageFont.load_default()
+    font = _load_font()
+    img_w, img_h, shapes = _layout_tree(tree, font)
 
-    # compute whole image size
-    tw, th = _subtree_size(tree, font)
-    img_w = int(tw + 2 * PADDING)
-    img_h = int(th + 2 * PADDING)
+    # too large for one bitmap: write tiles next to the requested file instead
+    if img_w * img_h > MAX_PIXELS:
+        folder = os.path.splitext(filename)[0] + "-tiles"
+        print(f"Tree image {img_w}x{img_h} exceeds {MAX_PIXELS} pixels, exporting tiles instead.")
+        _save_tiles(shapes, img_w, img_h, font, folder, TILE_SIZE)
+        return
 
     img = Image.new("RGB", (img_w, img_h), "white")
     draw = ImageDraw.Draw(img)
-
-    # center root horizontally
-    root_center_x = img_w / 2
-    root_top_y = PADDING
-    _draw_subtree(draw, tree, root_center_x, root_top_y, font)
+    _draw_shapes(draw, shapes, font)
 
     img.save(filename)
     print(f"Saved PNG: {filename}\n")
+
+# Export tree as fixed-size PNG tiles plus a manifest.json index
+def export_tree_png_tiled(tree, folder, tile_size=TILE_SIZE):
+    """Only one tile bitmap is held in memory at a time.
+    Returns the path of the manifest describing every tile.
+    """
+    font = _load_font()
+    img_w, img_h, shapes = _layout_tree(tree, font)
+    return _save_tiles(shapes, img_w, img_h, font, folder, tile_size)
+
+# Draw and save tiles one at a time, then write the manifest
+def _save_tiles(shapes, img_w, img_h, font, folder, tile_size):
+    cols = -(-img_w // tile_size)
+    rows = -(-img_h // tile_size)
+
+    # bucket shapes by the tiles they intersect, keeping drawing order
+    buckets = {}
+    for shape in shapes:
+        left, top, right, bottom = _shape_bounds(shape)
+        for r in _tile_range(top, bottom, tile_size, rows):
+            for c in _tile_range(left, right, tile_size, cols):
+                buckets.setdefault((r, c), []).append(shape)
+
+    os.makedirs(folder, exist_ok=True)
+    tiles = []
+    for r in range(rows):
+        for c in range(cols):
+            x0, y0 = c * tile_size, r * tile_size
+            w = min(tile_size, img_w - x0)
+            h = min(tile_size, img_h - y0)
+
+            img = Image.new("RGB", (w, h), "white")
+            draw = ImageDraw.Draw(img)
+            # draw in tile-local coordinates
+            _draw_shapes(draw, buckets.get((r, c), []), font, x0, y0)
+
+            name = f"tile-{r}-{c}.png"
+            img.save(os.path.join(folder, name))
+            img.close()
+            tiles.append({"file": name, "row": r, "col": c, "x": x0, "y": y0, "width": w, "height": h})
+
+    manifest = {
+        "width": img_w,
+        "height": img_h,
+        "tile_size": tile_size,
+        "rows": rows,
+        "cols": cols,
+        "tiles": tiles,
+    }
+    manifest_path = os.path.join(folder, "manifest.json")
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    print(f"Saved {len(tiles)} PNG tiles: {folder}\n")
+    return manifest_path